@@ -24,12 +24,60 @@ genome-scale metabolic model test suite.
 
 from __future__ import absolute_import
 
-from memote.utils import show_versions
-from memote.suite.api import *
-from memote.suite.results import *
-from memote.suite.reporting import *
-from memote.jinja2_extension import *
+import sys
+from importlib import import_module
 
 __author__ = "Moritz E. Beber"
 __email__ = "morbeb@biosustain.dtu.dk"
 __version__ = "0.9.6"
+
+# Map each public name to the module that provides it. The modules pull in
+# heavy dependencies (cobra, pytest, sqlalchemy, and more) and are therefore
+# only imported when the name is first accessed. Importing the `memote`
+# package itself, for example, for `__version__`, stays cheap this way.
+_ATTRIBUTES = {
+    "show_versions": "memote.utils",
+    "validate_model": "memote.suite.api",
+    "test_model": "memote.suite.api",
+    "snapshot_report": "memote.suite.api",
+    "diff_report": "memote.suite.api",
+    "history_report": "memote.suite.api",
+    "MemoteResult": "memote.suite.results",
+    "ResultManager": "memote.suite.results",
+    "RepoResultManager": "memote.suite.results",
+    "SQLResultManager": "memote.suite.results",
+    "make_engine": "memote.suite.results",
+    "HistoryManager": "memote.suite.results",
+    "ReportConfiguration": "memote.suite.reporting",
+    "SnapshotReport": "memote.suite.reporting",
+    "HistoryReport": "memote.suite.reporting",
+    "DiffReport": "memote.suite.reporting",
+    "MemoteExtension": "memote.jinja2_extension",
+}
+
+__all__ = tuple(_ATTRIBUTES)
+
+if sys.version_info < (3, 7):
+    # Module level `__getattr__` (PEP 562) requires Python 3.7. Older
+    # interpreters import everything up front as before.
+    from memote.utils import show_versions
+    from memote.suite.api import *
+    from memote.suite.results import *
+    from memote.suite.reporting import *
+    from memote.jinja2_extension import *
+else:
+    def __getattr__(name):
+        """Import a public attribute's module on first access."""
+        try:
+            module = import_module(_ATTRIBUTES[name])
+        except KeyError:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(__name__, name))
+        value = getattr(module, name)
+        # Cache the attribute so later accesses skip this function.
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        """Include the lazily provided attributes in the module listing."""
+        return sorted(set(globals()) | set(_ATTRIBUTES))
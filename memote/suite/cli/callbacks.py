@@ -24,9 +24,6 @@ import sys
 import logging
 
 import click
-import git
-
-from memote.experimental import ExperimentConfiguration
 
 
 LOGGER = logging.getLogger(__name__)
@@ -42,6 +39,9 @@ def validate_collect(context, param, value):
 
 def validate_experimental(context, param, value):
     """Load and validate an experimental data configuration."""
+    # Imported locally to keep the command line interface responsive.
+    from memote.experimental import ExperimentConfiguration
+
     if value is None:
         return
     config = ExperimentConfiguration(value)
@@ -77,6 +77,9 @@ def validate_username(context, param, value):
 
 def probe_git():
     """Return a git repository instance if it exists."""
+    # Imported locally to keep the command line interface responsive.
+    import git
+
     try:
         repo = git.Repo()
     except git.InvalidGitRepositoryError:
@@ -25,18 +25,12 @@ from builtins import open
 from multiprocessing import Pool
 from functools import partial
 
-from libsbml import SBMLError
 import click
-import git
-from sqlalchemy.exc import ArgumentError
 import os
 
-import memote.suite.api as api
 import memote.utils as utils
-import memote.suite.results as managers
 import memote.suite.cli.callbacks as callbacks
 from memote.suite.cli import CONTEXT_SETTINGS
-from memote.suite.reporting import ReportConfiguration
 
 LOGGER = logging.getLogger(__name__)
 
@@ -94,6 +88,10 @@ def snapshot(model, filename, pytest_args, exclusive, skip, solver,
     MODEL: Path to model file. Can also be supplied via the environment variable
     MEMOTE_MODEL or configured in 'setup.cfg' or 'memote.ini'.
     """
+    # Imported locally to keep the command line interface responsive.
+    import memote.suite.api as api
+    from memote.suite.reporting import ReportConfiguration
+
     model_obj, sbml_ver, notifications = api.validate_model(
         model)
     if model_obj is None:
@@ -143,6 +141,14 @@ def snapshot(model, filename, pytest_args, exclusive, skip, solver,
                    "option can be specified multiple times.")
 def history(location, model, filename, deployment, custom_config):
     """Generate a report over a model's git commit history."""
+    # Imported locally to keep the command line interface responsive.
+    import git
+    from sqlalchemy.exc import ArgumentError
+
+    import memote.suite.api as api
+    import memote.suite.results as managers
+    from memote.suite.reporting import ReportConfiguration
+
     if location is None:
         raise click.BadParameter("No 'location' given or configured.")
     try:
@@ -173,6 +179,8 @@ def history(location, model, filename, deployment, custom_config):
 
 def _test_diff(model_and_model_ver_tuple, pytest_args, skip,
                exclusive, experimental):
+    import memote.suite.api as api
+
     model, sbml_ver = model_and_model_ver_tuple
     _, diff_results = api.test_model(
         model, sbml_version=sbml_ver, results=True, pytest_args=pytest_args,
@@ -226,6 +234,12 @@ def diff(models, filename, pytest_args, exclusive, skip, solver,
 
     MODELS: List of paths to two or more model files.
     """
+    # Imported locally to keep the command line interface responsive.
+    from libsbml import SBMLError
+
+    import memote.suite.api as api
+    from memote.suite.reporting import ReportConfiguration
+
     if not any(a.startswith("--tb") for a in pytest_args):
         pytest_args = ["--tb", "no"] + pytest_args
     # Add further directories to search for tests.
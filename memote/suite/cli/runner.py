@@ -19,36 +19,28 @@
 
 from __future__ import absolute_import
 
+import hashlib
+import io
+import json
 import os
 import sys
 import logging
+import multiprocessing
+from functools import partial
 from gzip import GzipFile
-from os.path import join, isfile
-from multiprocessing import Process
+from os.path import basename, isdir, isfile, join
 from getpass import getpass
-from time import sleep
+from time import sleep, time
 from tempfile import mkdtemp
 from shutil import copy2, move
 
 import click
 import click_log
-import git
-import travis.encrypt as te
-from cookiecutter.main import cookiecutter, get_user_config
-from github import (
-    Github, BadCredentialsException, UnknownObjectException, GithubException)
-from sqlalchemy import create_engine
-from sqlalchemy.exc import ArgumentError
-from travispy import TravisPy
-from travispy.errors import TravisError
-
-import memote.suite.api as api
+
 import memote.suite.cli.callbacks as callbacks
 from memote import __version__
 from memote.suite.cli import CONTEXT_SETTINGS
 from memote.suite.cli.reports import report
-from memote.suite.results import (
-    ResultManager, RepoResultManager, SQLResultManager, HistoryManager)
 from memote.utils import is_modified, stdout_notifications
 
 
@@ -134,10 +126,12 @@ def run(model, collect, filename, location, ignore_git, pytest_args, exclusive,
     MEMOTE_MODEL or configured in 'setup.cfg' or 'memote.ini'.
 
     """
-    def is_verbose(arg):
-        return (arg.startswith("--verbosity") or
-                arg.startswith("-v") or arg.startswith("--verbose") or
-                arg.startswith("-q") or arg.startswith("--quiet"))
+    # Imported locally to keep the command line interface responsive.
+    from sqlalchemy.exc import ArgumentError
+
+    import memote.suite.api as api
+    from memote.suite.results import (
+        ResultManager, RepoResultManager, SQLResultManager)
 
     if ignore_git:
         repo = None
@@ -149,10 +143,7 @@ def run(model, collect, filename, location, ignore_git, pytest_args, exclusive,
                 LOGGER.critical(
                     "Working with a repository requires a storage location.")
                 sys.exit(1)
-    if not any(a.startswith("--tb") for a in pytest_args):
-        pytest_args = ["--tb", "short"] + pytest_args
-    if not any(is_verbose(a) for a in pytest_args):
-        pytest_args.append("-vv")
+    _ensure_pytest_defaults(pytest_args, tb_style="short", verbosity="-vv")
     # Check if the model was changed in this commit. Exit `memote run` if this
     # was not the case.
     if skip_unchanged and repo is not None:
@@ -170,7 +161,7 @@ def run(model, collect, filename, location, ignore_git, pytest_args, exclusive,
             "The model could not be loaded due to the following SBML errors.")
         stdout_notifications(notifications)
         sys.exit(1)
-    model.solver = solver
+    _set_solver(model, solver)
     code, result = api.test_model(
         model=model, sbml_version=sbml_ver, results=True,
         pytest_args=pytest_args, skip=skip,
@@ -216,8 +207,8 @@ def run(model, collect, filename, location, ignore_git, pytest_args, exclusive,
               help="Create a memote repository using the exact same answers "
               "as before. This will not overwrite existing directories. If "
               "you want to adjust the answers, edit the template "
-              "'{}'.".format(join(get_user_config()["replay_dir"],
-                                  "cookiecutter-memote.json")))
+              "'cookiecutter-memote.json' in the cookiecutter replay "
+              "directory (by default '~/.cookiecutter_replay').")
 @click.option("--directory", type=click.Path(exists=True, file_okay=False,
                                              writable=True),
               help="Create a new model repository in the given directory.")
@@ -231,28 +222,254 @@ def new(directory, replay):
     --directory option.
 
     """
+    # Imported locally to keep the command line interface responsive.
+    from cookiecutter.main import cookiecutter
+
     if directory is None:
         directory = os.getcwd()
     cookiecutter("gh:opencobra/cookiecutter-memote", output_dir=directory,
                  replay=replay)
 
 
+def _ensure_pytest_defaults(pytest_args, tb_style, verbosity):
+    """
+    Complete the pytest arguments with defaults in a single pass.
+
+    User supplied arguments take precedence; each default is only added
+    when no conflicting flag was found. The list is modified in place.
+
+    Parameters
+    ----------
+    pytest_args : list of str
+        Additional arguments destined for pytest.
+    tb_style : str
+        The traceback style to use when the user did not choose one.
+    verbosity : str
+        The verbosity flag to append when the user did not choose one.
+
+    """
+    # Options registered by the cacheprovider and stepwise plugins; passing
+    # any of them requires the respective plugin to stay enabled.
+    cache_options = frozenset([
+        "--lf", "--last-failed", "--ff", "--failed-first", "--nf",
+        "--new-first", "--cache-clear", "--cache-show"])
+    stepwise_options = frozenset(["--sw", "--sw-skip"])
+    seen_tb = seen_verbosity = seen_cache = seen_stepwise = False
+    for arg in pytest_args:
+        option = arg.split("=", 1)[0]
+        if arg.startswith("--tb"):
+            seen_tb = True
+        elif (arg.startswith("-v") or arg.startswith("--verbos") or
+                arg.startswith("-q") or arg.startswith("--quiet")):
+            seen_verbosity = True
+        elif ("cacheprovider" in arg or option in cache_options or
+                option.startswith("--last-failed-no-failures")):
+            seen_cache = True
+        elif "stepwise" in arg or option in stepwise_options:
+            seen_stepwise = True
+    if not seen_tb:
+        pytest_args[:0] = ["--tb", tb_style]
+    if not seen_verbosity:
+        pytest_args.append(verbosity)
+    # Speed up pytest's own start-up by skipping plugins whose state is
+    # never used here.
+    if not seen_cache:
+        pytest_args.extend(["-p", "no:cacheprovider"])
+    if not seen_stepwise:
+        pytest_args.extend(["-p", "no:stepwise"])
+
+
+def _set_solver(model, solver):
+    """
+    Set the model's solver only when it differs from the current one.
+
+    Attaching a solver interface makes cobra rebuild the underlying
+    optlang model including all variables and constraints, which is
+    expensive and unnecessary when the requested solver is already
+    configured.
+
+    Parameters
+    ----------
+    model : cobra.Model
+        The metabolic model.
+    solver : str
+        The name of the requested solver, e.g., 'glpk'.
+
+    """
+    current = model.solver.interface.__name__.rsplit(".", 1)[-1]
+    if current != "{}_interface".format(solver):
+        model.solver = solver
+
+
+#: Buffer size used when streaming SBML documents (1 MiB).
+_BUFFER_SIZE = 1 << 20
+
+#: Linux ioctl request number for cloning a file (FICLONE).
+_FICLONE = 0x40049409
+
+
+def _snapshot(source, destination):
+    """
+    Copy a file, using a copy-on-write clone where the filesystem allows.
+
+    On filesystems with reflink support (btrfs, XFS, APFS) cloning takes
+    constant time regardless of size, whereas a byte-by-byte copy of a
+    large result database can dominate the start-up and teardown of
+    'memote history'. Falls back to a regular copy. Hard links are
+    deliberately not used since the snapshot is written to afterwards.
+
+    Parameters
+    ----------
+    source : str
+        The path of the file to copy.
+    destination : str
+        The target path or an existing target directory.
+
+    """
+    if isdir(destination):
+        destination = join(destination, basename(source))
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        try:
+            with open(source, "rb") as src_handle, \
+                    open(destination, "wb") as dst_handle:
+                fcntl.ioctl(dst_handle.fileno(), _FICLONE,
+                            src_handle.fileno())
+            return destination
+        except (IOError, OSError):
+            LOGGER.debug(
+                "The filesystem does not support cloning. Copying instead.")
+    elif sys.platform == "darwin":
+        import ctypes
+
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            status = libc.clonefile(
+                source.encode(), destination.encode(), 0)
+            if status == 0:
+                return destination
+        except (AttributeError, OSError):
+            pass
+        LOGGER.debug(
+            "The filesystem does not support cloning. Copying instead.")
+    return copy2(source, destination)
+
+
 def _model_from_stream(stream, filename):
+    import memote.suite.api as api
+
+    # Buffer the stream generously so that the SBML parser performs few
+    # large reads instead of many tiny ones.
+    stream = io.BufferedReader(stream, buffer_size=_BUFFER_SIZE)
     if filename.endswith(".gz"):
-        with GzipFile(fileobj=stream) as file_handle:
-            model, sbml_ver, notifications = api.validate_model(file_handle)
+        with GzipFile(fileobj=stream) as gzip_handle:
+            with io.BufferedReader(
+                    gzip_handle, buffer_size=_BUFFER_SIZE) as file_handle:
+                model, sbml_ver, notifications = api.validate_model(
+                    file_handle)
     else:
         model, sbml_ver, notifications = api.validate_model(stream)
     return model, sbml_ver, notifications
 
 
-def _test_history(model, sbml_ver, solver, manager, commit, pytest_args, skip,
-                  exclusive, experimental):
-    model.solver = solver
-    _, result = api.test_model(
-        model, sbml_version=sbml_ver, results=True, pytest_args=pytest_args,
-        skip=skip, exclusive=exclusive, experimental=experimental)
-    manager.store(result, commit=commit)
+def _resolve_blob(tree, path_parts, cache):
+    """
+    Resolve a blob within a commit tree, memoizing every traversal step.
+
+    Commits frequently share identical (sub)trees. Since a tree SHA is a
+    content hash, each step of the path lookup can be cached by
+    ``(tree hexsha, entry name)`` and reused across all commits that share
+    that (sub)tree, avoiding repeated tree walks.
+
+    Parameters
+    ----------
+    tree : git.Tree
+        The root tree of a commit.
+    path_parts : list of str
+        The components of the model's path within the repository.
+    cache : dict
+        Maps pairs of tree hexsha and entry name to tree or blob objects.
+
+    """
+    node = tree
+    for part in path_parts:
+        key = (node.hexsha, part)
+        try:
+            node = cache[key]
+        except KeyError:
+            cache[key] = node = node[part]
+    return node
+
+
+def _group_identical_blobs(payloads):
+    """
+    Group scheduled commits by their model blob SHA.
+
+    The first commit encountered for each unique blob SHA is kept as the
+    payload to run, and every later commit with the same blob is recorded
+    to receive a copy of that commit's result.
+
+    Parameters
+    ----------
+    payloads : list of tuple
+        Payloads of commit hexsha, blob hexsha, blob bytes, and filename.
+        The commits must be unique.
+
+    Returns
+    -------
+    tuple
+        A pair of the de-duplicated payloads and a dict mapping each
+        scheduled commit to the list of commits its result is stored for.
+
+    """
+    unique = list()
+    shared = dict()
+    by_blob = dict()
+    for payload in payloads:
+        commit, blob_hexsha = payload[0], payload[1]
+        if blob_hexsha in by_blob:
+            first = by_blob[blob_hexsha]
+            LOGGER.info(
+                "The model in commit '{}' is identical to the one in "
+                "commit '{}'. Reusing its result.".format(commit, first))
+            shared[first].append(commit)
+        else:
+            by_blob[blob_hexsha] = commit
+            shared[commit] = [commit]
+            unique.append(payload)
+    return unique, shared
+
+
+def _test_history(payload, solver, pytest_args, skip, exclusive,
+                  experimental):
+    """
+    Run the test suite on a single commit's model in a worker process.
+
+    The payload contains the raw SBML bytes rather than a parsed model
+    since cobra models cannot reliably be pickled across process
+    boundaries.
+
+    """
+    import memote.suite.api as api
+
+    commit, blob_hexsha, blob_bytes, filename = payload
+    try:
+        model, sbml_ver, notifications = _model_from_stream(
+            io.BytesIO(blob_bytes), filename)
+        if model is None:
+            return commit, None, notifications
+        _set_solver(model, solver)
+        _, result = api.test_model(
+            model, sbml_version=sbml_ver, results=True,
+            pytest_args=pytest_args, skip=skip, exclusive=exclusive,
+            experimental=experimental)
+        return commit, result, notifications
+    except Exception:
+        # A single broken commit must not abort the whole history rebuild.
+        LOGGER.critical(
+            "The test suite failed for commit '%s'.", commit, exc_info=True)
+        return commit, None, None
 
 
 @cli.command(context_settings=CONTEXT_SETTINGS)
@@ -278,12 +495,21 @@ def _test_history(model, sbml_ver, solver, manager, commit, pytest_args, skip,
 @click.option("--skip", multiple=True, metavar="TEST",
               help="The name of a test or test module to be skipped. This "
                    "option can be used multiple times.")
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=None,
+              help="The number of commits to test in parallel. Defaults to "
+                   "the number of CPUs.")
+@click.option("--reuse-identical-blobs", is_flag=True,
+              help="Run the test suite only once per unique model file "
+                   "content and share that result between all commits whose "
+                   "model blobs are identical. The suite is deterministic "
+                   "for a given model and solver.")
 @click.argument("model", type=click.Path(exists=False, dir_okay=False),
                 envvar="MEMOTE_MODEL")
 @click.argument("message")
 @click.argument("commits", metavar="[COMMIT] ...", nargs=-1)
 def history(model, message, rewrite, solver, location, pytest_args, deployment,
-            commits, skip, exclusive, experimental=None):  # noqa: D301
+            commits, skip, exclusive, jobs, reuse_identical_blobs,
+            experimental=None):  # noqa: D301
     """
     Re-compute test results for the git branch history.
 
@@ -306,11 +532,23 @@ def history(model, message, rewrite, solver, location, pytest_args, deployment,
        for those only. This can also be achieved by supplying a commit range.
 
     """
+    # Imported locally to keep the command line interface responsive.
+    import git
+    from sqlalchemy.exc import ArgumentError
+
+    from memote.suite.results import (
+        RepoResultManager, SQLResultManager, HistoryManager, make_engine)
+
     callbacks.validate_path(model)
     if location is None:
         raise click.BadParameter("No 'location' given or configured.")
-    if "--tb" not in pytest_args:
-        pytest_args = ["--tb", "no"] + pytest_args
+    if jobs is None:
+        try:
+            jobs = multiprocessing.cpu_count()
+        except NotImplementedError:
+            jobs = 1
+    # The per-commit console output is not used, hence quiet by default.
+    _ensure_pytest_defaults(pytest_args, tb_style="no", verbosity="-q")
     try:
         repo = git.Repo()
     except git.InvalidGitRepositoryError:
@@ -319,85 +557,259 @@ def history(model, message, rewrite, solver, location, pytest_args, deployment,
             "the model's commit history.")
         sys.exit(1)
     previous = repo.active_branch
+    deployment_branch = repo.heads[deployment]
     # Temporarily move the results to a new location so that they are
     # available while checking out the various commits.
-    repo.heads[deployment].checkout()
+    deployment_branch.checkout()
     engine = None
+    manager = None
+    new_location = None
+    url = None
     tmp_location = mkdtemp()
     try:
-        # Test if the location can be opened as a database.
-        engine = create_engine(location)
-        engine.dispose()
-        new_location = location
-        if location.startswith("sqlite"):
-            # Copy the SQLite database to a temporary location. Other
-            # databases are not file-based and thus git independent.
-            url = location.split("/", maxsplit=3)
-            if isfile(url[3]):
-                copy2(url[3], tmp_location)
-            new_location = "{}/{}".format(
-                "/".join(url[:3] + [tmp_location]), url[3])
-            LOGGER.info("Temporarily moving database from '%s' to '%s'.",
-                        url[3], join(tmp_location, url[3]))
-        manager = SQLResultManager(repository=repo, location=new_location)
-    except (AttributeError, ArgumentError):
-        LOGGER.info("Temporarily moving results from '%s' to '%s'.",
-                    location, tmp_location)
-        move(location, tmp_location)
-        new_location = join(tmp_location, location)
-        manager = RepoResultManager(repository=repo, location=new_location)
-    history = HistoryManager(repository=repo, manager=manager)
-    history.load_history(model, skip={deployment})
-    if len(commits) == 0:
-        commits = list(history.iter_commits())
-    elif len(commits) == 1 and ".." in commits[0]:
-        commits = repo.git.rev_list(commits[0]).split(os.linesep)
-    for commit in commits:
-        cmt = repo.commit(commit)
-        # Rewrite to full length hexsha.
-        commit = cmt.hexsha
-        if not is_modified(model, cmt):
-            LOGGER.info(
-                "The model was not modified in commit '{}'. "
-                "Skipping.".format(commit))
-            continue
-        # Should we overwrite an existing result?
-        if commit in history and not rewrite:
+        try:
+            # Test if the location can be opened as a database.
+            engine = make_engine(location)
+            new_location = location
+            if location.startswith("sqlite"):
+                # Copy the SQLite database to a temporary location. Other
+                # databases are not file-based and thus git independent.
+                engine.dispose()
+                url = location.split("/", maxsplit=3)
+                if isfile(url[3]):
+                    _snapshot(url[3], tmp_location)
+                new_location = "{}/{}".format(
+                    "/".join(url[:3] + [tmp_location]), url[3])
+                LOGGER.info("Temporarily moving database from '%s' to '%s'.",
+                            url[3], join(tmp_location, url[3]))
+                manager = SQLResultManager(
+                    repository=repo, location=new_location)
+            else:
+                # Keep the probe engine so that its connection pool is
+                # reused for storing the results.
+                manager = SQLResultManager(
+                    repository=repo, location=new_location, engine=engine)
+        except (AttributeError, ArgumentError):
+            LOGGER.info("Temporarily moving results from '%s' to '%s'.",
+                        location, tmp_location)
+            move(location, tmp_location)
+            new_location = join(tmp_location, location)
+            manager = RepoResultManager(
+                repository=repo, location=new_location)
+        history = HistoryManager(repository=repo, manager=manager)
+        history.load_history(model, skip={deployment})
+        # Pre-compute the commits that touched the model with a single
+        # path-restricted history walk. This is considerably cheaper than
+        # probing `commit.stats.files` once per commit, which shells out to
+        # `git diff-tree` every time. Full history is required since git's
+        # default simplification would prune commits on merged side
+        # branches as well as merge commits themselves.
+        touched = frozenset(
+            cmt.hexsha for cmt in repo.iter_commits(
+                "--all", paths=model, full_history=True))
+        if len(commits) == 0:
+            # Commits from the history are full length hexshas and can be
+            # filtered directly. User supplied commits may be abbreviated
+            # and are checked inside the loop after expansion.
+            commits = [commit for commit in history.iter_commits()
+                       if commit in touched]
+        elif len(commits) == 1 and ".." in commits[0]:
+            commits = repo.git.rev_list(commits[0]).split(os.linesep)
+        # Materialize the model blobs on the main process since git objects
+        # are not fork-safe. The raw bytes can be pickled to the workers.
+        model_parts = model.split("/")
+        blob_cache = dict()
+        # Stream each unique blob from the object database only once, even
+        # when several commits point to an identical model file.
+        blob_bytes_cache = dict()
+        payloads = list()
+        scheduled = set()
+        for commit in commits:
+            cmt = repo.commit(commit)
+            # Rewrite to full length hexsha.
+            commit = cmt.hexsha
+            # The same commit may be given more than once, for example, both
+            # abbreviated and in full. It must be scheduled only once or the
+            # result sharing bookkeeping below would be corrupted.
+            if commit in scheduled:
+                LOGGER.info(
+                    "Commit '{}' was given more than once. "
+                    "Skipping duplicate.".format(commit))
+                continue
+            scheduled.add(commit)
+            if commit not in touched:
+                LOGGER.info(
+                    "The model was not modified in commit '{}'. "
+                    "Skipping.".format(commit))
+                continue
+            # Should we overwrite an existing result?
+            if commit in history and not rewrite:
+                LOGGER.info(
+                    "Result for commit '{}' exists. Skipping.".format(commit))
+                continue
             LOGGER.info(
-                "Result for commit '{}' exists. Skipping.".format(commit))
-            continue
-        LOGGER.info(
-            "Running the test suite for commit '{}'.".format(commit))
-        blob = cmt.tree[model]
-        model_obj, sbml_ver, notifications = _model_from_stream(
-            blob.data_stream, blob.name
-        )
-        if model_obj is None:
-            LOGGER.critical("The model could not be loaded due to the "
-                            "following SBML errors.")
-            stdout_notifications(notifications)
-            continue
-        proc = Process(
-            target=_test_history,
-            args=(model_obj, sbml_ver, solver, manager, commit,
-                  pytest_args, skip, exclusive, experimental))
-        proc.start()
-        proc.join()
-    # Copy back all new and modified files and add them to the index.
-    repo.heads[deployment].checkout()
-    if engine is not None:
-        manager.session.close()
-        if location.startswith("sqlite"):
-            copy2(join(tmp_location, url[3]), url[3])
-    else:
-        move(new_location, os.getcwd())
-    repo.git.add(".")
-    repo.index.commit(message)
-    # Checkout the original branch.
-    previous.checkout()
+                "Scheduling the test suite for commit '{}'.".format(commit))
+            blob = _resolve_blob(cmt.tree, model_parts, blob_cache)
+            try:
+                blob_bytes = blob_bytes_cache[blob.hexsha]
+            except KeyError:
+                blob_bytes = blob.data_stream.read()
+                blob_bytes_cache[blob.hexsha] = blob_bytes
+            payloads.append((commit, blob.hexsha, blob_bytes, blob.name))
+        # Map each scheduled commit to the commits its result is stored for.
+        if reuse_identical_blobs:
+            # Commits whose model blobs are identical share a single result.
+            payloads, shared = _group_identical_blobs(payloads)
+        else:
+            shared = {payload[0]: [payload[0]] for payload in payloads}
+        if len(payloads) > 0:
+            worker = partial(
+                _test_history, solver=solver, pytest_args=pytest_args,
+                skip=skip, exclusive=exclusive, experimental=experimental)
+            try:
+                # A forkserver process pays the interpreter and import
+                # start-up cost only once; every pool worker is then forked
+                # cheaply from the warm server instead of starting a fresh
+                # interpreter.
+                context = multiprocessing.get_context("forkserver")
+            except (AttributeError, ValueError):
+                # Python 2 has no start method contexts and Windows only
+                # supports 'spawn'.
+                context = multiprocessing
+            # Each worker handles a single commit and is then replaced:
+            # pytest leaks plugin and collection state between in-process
+            # runs, and a per-task fork from the warm (fork)server is cheap.
+            pool = context.Pool(
+                processes=min(jobs, len(payloads)), maxtasksperchild=1)
+            try:
+                # Results are stored on the main process in order to avoid
+                # database writer contention between the workers.
+                for commit, result, notifications in pool.imap_unordered(
+                        worker, payloads):
+                    if result is None:
+                        if notifications is not None:
+                            LOGGER.critical(
+                                "The model at commit '{}' could not be "
+                                "loaded due to the following SBML "
+                                "errors.".format(commit))
+                            stdout_notifications(notifications)
+                        continue
+                    for hexsha in shared[commit]:
+                        manager.store(result, commit=hexsha)
+            finally:
+                pool.close()
+                pool.join()
+    finally:
+        # Always restore the deployment branch, commit whatever results
+        # were stored, and check out the original branch again — even when
+        # the rebuild fails part way through. Otherwise an error would
+        # leave the repository on the deployment branch with the results
+        # stranded in the temporary directory.
+        deployment_branch.checkout()
+        if engine is not None:
+            if manager is not None:
+                manager.session.close()
+            if url is not None and isfile(join(tmp_location, url[3])):
+                _snapshot(join(tmp_location, url[3]), url[3])
+        elif manager is not None:
+            move(new_location, os.getcwd())
+        repo.git.add(".")
+        repo.index.commit(message)
+        # Checkout the original branch.
+        previous.checkout()
     LOGGER.info("Done.")
 
 
+def _retrieve_public_key(full_name, ttl=3600):
+    """
+    Retrieve the Travis public key for a repository with a file-based cache.
+
+    The key is fetched over the network at most once per TTL (default one
+    hour) and otherwise read from the memote application directory. This
+    avoids a repeated round-trip when 'memote online' is re-run, for
+    example, after an aborted attempt.
+
+    Parameters
+    ----------
+    full_name : str
+        The repository slug, i.e., '<username>/<repository>'.
+    ttl : int, optional
+        The maximum age of a cached key in seconds.
+
+    """
+    # Imported locally to keep the command line interface responsive.
+    import travis.encrypt as te
+
+    cache_dir = click.get_app_dir("memote")
+    digest = hashlib.sha1(full_name.encode()).hexdigest()
+    cache_file = join(cache_dir, "public_key_{}.json".format(digest))
+    try:
+        with open(cache_file) as file_handle:
+            record = json.load(file_handle)
+        if (time() - record["created"]) < ttl:
+            LOGGER.debug("Using the cached public key.")
+            return record["key"]
+    except (IOError, OSError, KeyError, ValueError):
+        pass
+    key = te.retrieve_public_key(full_name)
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with open(cache_file, "w") as file_handle:
+            json.dump({"created": time(), "key": key}, file_handle)
+    except (IOError, OSError):
+        LOGGER.debug("Could not cache the public key.", exc_info=True)
+    return key
+
+
+def _add_secure_variable(text, secret):
+    """
+    Add an encrypted environment variable to Travis configuration text.
+
+    The round-trip loader is only used when the configuration contains
+    comments since it is much slower than the safe loader. Either way the
+    document's key order is preserved.
+
+    Parameters
+    ----------
+    text : str
+        The contents of a '.travis.yml' file. May be empty.
+    secret : str
+        The encrypted environment variable assignment.
+
+    Returns
+    -------
+    str
+        The updated configuration text.
+
+    """
+    # Imported locally to keep the command line interface responsive.
+    from ruamel.yaml import YAML
+
+    if "#" in text:
+        # Only the (much slower) round-trip loader preserves comments.
+        yml = YAML(typ="rt")
+    else:
+        yml = YAML(typ="safe")
+        yml.default_flow_style = False
+        # The safe dumper alphabetizes mappings by default, which would
+        # reorder the user's entire configuration on dump.
+        yml.representer.sort_base_mapping_type_on_output = False
+    config = yml.load(text)
+    if config is None:
+        config = {}
+    global_env = config.setdefault("env", {}).get("global")
+    if global_env is None:
+        config["env"]["global"] = global_env = {}
+    try:
+        global_env["secure"] = secret
+    except TypeError:
+        global_env.append({"secure": secret})
+    buffer = io.StringIO()
+    yml.dump(config, buffer)
+    return buffer.getvalue()
+
+
 @cli.command(context_settings=CONTEXT_SETTINGS)
 @click.help_option("--help", "-h")
 @click.option("--note", default="memote-ci access", show_default=True,
@@ -410,6 +822,16 @@ def history(model, message, rewrite, solver, location, pytest_args, deployment,
               help="The GitHub username. Usually this is configured for you.")
 def online(note, github_repository, github_username):
     """Upload the repository to GitHub and enable testing on Travis CI."""
+    # Imported locally to keep the command line interface responsive.
+    import git
+    import keyring
+    import travis.encrypt as te
+    from github import (
+        Github, BadCredentialsException, UnknownObjectException,
+        GithubException)
+    from travispy import TravisPy
+    from travispy.errors import TravisError
+
     try:
         repo = git.Repo()
     except git.InvalidGitRepositoryError:
@@ -417,16 +839,56 @@ def online(note, github_repository, github_username):
             "'memote online' requires a git repository in order to follow "
             "the current branch's commit history.")
         sys.exit(1)
-    password = getpass("GitHub Password: ")
-    gh = Github(github_username, password)
-    user = gh.get_user()
+    # Reuse a previously created token from the system keyring if possible,
+    # avoiding both the password prompt and the authorization round-trip.
     try:
-        when = user.created_at.isoformat(sep=" ")
-        LOGGER.info(
-            "Logged in to user '{}' created on '{}'.".format(user.login, when))
-    except BadCredentialsException:
-        LOGGER.critical("Incorrect username or password!")
-        sys.exit(1)
+        token = keyring.get_password("memote", github_username)
+    except keyring.errors.KeyringError:
+        # Headless environments may have no usable keyring backend at all.
+        LOGGER.debug(
+            "Could not read a token from the system keyring.", exc_info=True)
+        token = None
+    if token is not None:
+        gh = Github(token)
+        user = gh.get_user()
+        try:
+            LOGGER.info(
+                "Logged in to user '{}' using the token stored in the "
+                "system keyring.".format(user.login))
+        except BadCredentialsException:
+            LOGGER.warning("The stored token is no longer valid.")
+            token = None
+    if token is None:
+        password = getpass("GitHub Password: ")
+        gh = Github(github_username, password)
+        user = gh.get_user()
+        try:
+            when = user.created_at.isoformat(sep=" ")
+            LOGGER.info(
+                "Logged in to user '{}' created on '{}'.".format(
+                    user.login, when))
+        except BadCredentialsException:
+            LOGGER.critical("Incorrect username or password!")
+            sys.exit(1)
+        if note == "memote-ci access":
+            note = "{} to {}".format(note, github_repository)
+        try:
+            LOGGER.info("Creating token.")
+            auth = user.create_authorization(scopes=["repo"], note=note)
+        except GithubException:
+            LOGGER.critical(
+                "A personal access token with the note '{}' already exists. "
+                "Either delete it or choose another note using the option "
+                "'--note'.".format(note))
+            sys.exit(1)
+        token = auth.token
+        try:
+            # Persist the token (never the password) for later invocations.
+            keyring.set_password("memote", github_username, token)
+        except keyring.errors.KeyringError:
+            LOGGER.debug(
+                "Could not store the token in the system keyring.",
+                exc_info=True)
     try:
         gh_repo = user.get_repo(github_repository)
         LOGGER.warning(
@@ -434,20 +896,9 @@ def online(note, github_repository, github_username):
             "settings.".format(github_repository))
     except UnknownObjectException:
         gh_repo = user.create_repo(github_repository)
-    if note == "memote-ci access":
-        note = "{} to {}".format(note, github_repository)
-    try:
-        LOGGER.info("Creating token.")
-        auth = user.create_authorization(scopes=["repo"], note=note)
-    except GithubException:
-        LOGGER.critical(
-            "A personal access token with the note '{}' already exists. "
-            "Either delete it or choose another note using the option "
-            "'--note'.".format(note))
-        sys.exit(1)
     try:
         LOGGER.info("Authorizing with TravisCI.")
-        travis = TravisPy.github_auth(auth.token)
+        travis = TravisPy.github_auth(token)
         t_user = travis.user()
     except TravisError:
         LOGGER.critical(
@@ -455,8 +906,19 @@ def online(note, github_repository, github_username):
             "link your GitHub account on 'https://travis-ci.org/'!")
         sys.exit(1)
     LOGGER.info("Synchronizing repositories.")
-    while not t_user.sync():
-        sleep(0.1)
+    # Poll with exponential backoff since every attempt is a full HTTPS
+    # round-trip and overly eager polling runs into Travis' rate limits.
+    delay = 0.5
+    for _ in range(30):
+        if t_user.sync():
+            break
+        sleep(delay)
+        delay = min(delay * 1.5, 5.0)
+    else:
+        LOGGER.critical(
+            "Timed out waiting for Travis CI to synchronize your "
+            "repositories. Please try again later.")
+        sys.exit(1)
     try:
         t_repo = travis.repo(gh_repo.full_name)
     except TravisError:
@@ -473,18 +935,18 @@ def online(note, github_repository, github_username):
         sys.exit(1)
     LOGGER.info(
         "Encrypting GitHub token for repo '{}'.".format(gh_repo.full_name))
-    key = te.retrieve_public_key(gh_repo.full_name)
-    secret = te.encrypt_key(key, "GITHUB_TOKEN={}".format(auth.token).encode())
+    key = _retrieve_public_key(gh_repo.full_name)
+    secret = te.encrypt_key(key, "GITHUB_TOKEN={}".format(token).encode())
     LOGGER.info("Storing GitHub token in '.travis.yml'.")
-    config = te.load_travis_configuration(".travis.yml")
-    global_env = config.setdefault("env", {}).get("global")
-    if global_env is None:
-        config["env"]["global"] = global_env = {}
+    # Read the configuration exactly once; an absent or empty file simply
+    # yields a fresh configuration.
     try:
-        global_env["secure"] = secret
-    except TypeError:
-        global_env.append({"secure": secret})
-    te.dump_travis_configuration(config, ".travis.yml")
+        with open(".travis.yml") as file_handle:
+            text = file_handle.read()
+    except (IOError, OSError):
+        text = ""
+    with open(".travis.yml", "w") as file_handle:
+        file_handle.write(_add_secure_variable(text, secret))
     repo.index.add([".travis.yml"])
     repo.index.commit("chore: add encrypted GitHub access token")
     repo.remotes.origin.push(all=True)
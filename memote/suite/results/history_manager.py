@@ -26,7 +26,6 @@ from six import iteritems, iterkeys
 from sqlalchemy.orm.exc import NoResultFound
 
 from memote.suite.results import MemoteResult
-from memote.utils import is_modified
 
 __all__ = ("HistoryManager",)
 
@@ -67,6 +66,15 @@ class HistoryManager(object):
         self._history = dict()
         self._history["commits"] = commits = dict()
         self._history["branches"] = branches = dict()
+        # A single path-restricted walk over all branches is much cheaper
+        # than checking each commit's diff stats individually. Full history
+        # is required since git's default simplification would prune
+        # commits on merged side branches as well as merge commits
+        # themselves.
+        touched = frozenset(
+            commit.hexsha
+            for commit in self._repo.iter_commits(
+                "--all", paths=model, full_history=True))
         for branch in self._repo.refs:
             LOGGER.debug(branch.name)
             if branch.name in skip:
@@ -76,7 +84,7 @@ class HistoryManager(object):
             history = [latest] + list(latest.iter_parents())
             for commit in history:
                 # Find model in committed files.
-                if not is_modified(model, commit):
+                if commit.hexsha not in touched:
                     LOGGER.info(
                         "The model was not modified in commit '{}'. "
                         "Skipping.".format(commit))
@@ -20,37 +20,73 @@
 from __future__ import absolute_import
 
 import logging
+from multiprocessing import cpu_count
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm.exc import NoResultFound
+from sqlalchemy.pool import StaticPool
 
 from memote.suite.results.result import MemoteResult
 from memote.suite.results.repo_result_manager import RepoResultManager
 from memote.suite.results.models import Result, Base
 
-__all__ = ("SQLResultManager",)
+__all__ = ("SQLResultManager", "make_engine")
 
 LOGGER = logging.getLogger(__name__)
 
 Session = sessionmaker()
 
 
+def make_engine(location):
+    """
+    Create an SQLAlchemy engine with a sized connection pool.
+
+    SQLite databases are file-based and gain nothing from connection
+    pooling so they share a single connection instead. Networked databases
+    get a bounded LIFO pool with pre-ping so that connections are reused
+    across many short transactions.
+
+    Parameters
+    ----------
+    location : str
+        A database connection URL.
+
+    """
+    if location.startswith("sqlite"):
+        return create_engine(
+            location, poolclass=StaticPool,
+            connect_args={"check_same_thread": False})
+    try:
+        pool_size = min(cpu_count(), 10)
+    except NotImplementedError:
+        pool_size = 4
+    return create_engine(
+        location, pool_size=pool_size, max_overflow=20,
+        pool_timeout=30, pool_recycle=1800, pool_pre_ping=True,
+        pool_use_lifo=True)
+
+
 class SQLResultManager(RepoResultManager):
     """Manage storage of results to a database."""
 
-    def __init__(self, **kwargs):
+    def __init__(self, engine=None, **kwargs):
         """
         Initialize the repository aware database storage manager.
 
         Parameters
         ----------
+        engine : sqlalchemy.engine.Engine, optional
+            An existing engine to reuse, for example, in order to share a
+            connection pool. By default a new engine is created for the
+            given location.
         location : str
             A Database connection URL.
 
         """
         super(SQLResultManager, self).__init__(**kwargs)
-        self._backend = create_engine(self._backend)
+        self._backend = make_engine(self._backend) if engine is None \
+            else engine
         # Create the database and tables if it doesn't exist.
         Base.metadata.create_all(self._backend, checkfirst=True)
         self.session = Session(bind=self._backend)
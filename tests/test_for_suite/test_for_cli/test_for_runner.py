@@ -25,7 +25,9 @@ from os.path import exists, join
 
 import pytest
 
-from memote.suite.cli.runner import cli
+from memote.suite.cli.runner import (
+    _add_secure_variable, _ensure_pytest_defaults, _group_identical_blobs,
+    cli)
 
 
 def test_cli(runner):
@@ -63,6 +65,97 @@ def test_run_output_TODO(runner, tmpdir):
     # TODO: Check complete template structure.
 
 
+@pytest.mark.parametrize("pytest_args, expected", [
+    ([],
+     ["--tb", "short", "-vv", "-p", "no:cacheprovider", "-p", "no:stepwise"]),
+    (["--tb", "long"],
+     ["--tb", "long", "-vv", "-p", "no:cacheprovider", "-p", "no:stepwise"]),
+    (["-qq"],
+     ["--tb", "short", "-qq", "-p", "no:cacheprovider", "-p", "no:stepwise"]),
+])
+def test_ensure_pytest_defaults(pytest_args, expected):
+    """Expect missing pytest defaults to be added in place."""
+    _ensure_pytest_defaults(pytest_args, tb_style="short", verbosity="-vv")
+    assert pytest_args == expected
+
+
+@pytest.mark.parametrize("conflict, plugin", [
+    (["--lf"], "no:cacheprovider"),
+    (["--failed-first"], "no:cacheprovider"),
+    (["--cache-clear"], "no:cacheprovider"),
+    (["--last-failed-no-failures=all"], "no:cacheprovider"),
+    (["--sw"], "no:stepwise"),
+    (["--stepwise"], "no:stepwise"),
+])
+def test_ensure_pytest_defaults_keeps_required_plugins(conflict, plugin):
+    """Expect plugins to stay enabled when any of their options is given."""
+    pytest_args = list(conflict)
+    _ensure_pytest_defaults(pytest_args, tb_style="short", verbosity="-vv")
+    assert plugin not in pytest_args
+
+
+def test_group_identical_blobs():
+    """Expect commits with identical model blobs to share one result."""
+    payloads = [
+        ("commit_a", "blob_1", b"", "test.xml"),
+        ("commit_b", "blob_2", b"", "test.xml"),
+        ("commit_c", "blob_1", b"", "test.xml"),
+    ]
+    unique, shared = _group_identical_blobs(payloads)
+    assert [payload[0] for payload in unique] == ["commit_a", "commit_b"]
+    assert shared == {
+        "commit_a": ["commit_a", "commit_c"],
+        "commit_b": ["commit_b"],
+    }
+
+
+def test_group_identical_blobs_all_unique():
+    """Expect unique blobs to map each commit to itself only."""
+    payloads = [
+        ("commit_a", "blob_1", b"", "test.xml"),
+        ("commit_b", "blob_2", b"", "test.xml"),
+    ]
+    unique, shared = _group_identical_blobs(payloads)
+    assert unique == payloads
+    assert shared == {"commit_a": ["commit_a"], "commit_b": ["commit_b"]}
+
+
+def test_add_secure_variable_preserves_order():
+    """Expect the travis configuration to keep its key order."""
+    text = (
+        "language: python\n"
+        "python:\n"
+        "- '3.6'\n"
+        "install:\n"
+        "- pip install .\n"
+        "script:\n"
+        "- memote run\n"
+    )
+    result = _add_secure_variable(text, "abc123")
+    keys = [line.split(":", 1)[0] for line in result.splitlines()
+            if line and not line.startswith(("-", " "))]
+    assert keys == ["language", "python", "install", "script", "env"]
+    assert "secure: abc123" in result
+
+
+def test_add_secure_variable_keeps_comments():
+    """Expect comments to survive the configuration update."""
+    text = (
+        "language: python\n"
+        "# Required for conda.\n"
+        "sudo: false\n"
+    )
+    result = _add_secure_variable(text, "abc123")
+    assert "# Required for conda." in result
+    assert result.index("language") < result.index("sudo")
+
+
+def test_add_secure_variable_from_scratch():
+    """Expect an empty configuration to gain only the secure variable."""
+    result = _add_secure_variable("", "abc123")
+    assert "secure: abc123" in result
+
+
 def test_run_skip_unchanged_false(runner, mock_repo):
     """Expect `memote run` to run when invoked on a commit with no changes."""
     previous_wd = os.getcwd()
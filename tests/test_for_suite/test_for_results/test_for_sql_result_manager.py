@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# Copyright 2018 Novo Nordisk Foundation Center for Biosustainability,
+# Technical University of Denmark.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test the expected behavior of engine creation for result storage."""
+
+from __future__ import absolute_import
+
+import pytest
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from memote.suite.results.sql_result_manager import make_engine
+
+
+def test_make_engine_sqlite():
+    """Expect sqlite locations to share a single static connection."""
+    engine = make_engine("sqlite://")
+    assert isinstance(engine.pool, StaticPool)
+
+
+def test_make_engine_networked():
+    """Expect networked locations to use a bounded connection pool."""
+    pytest.importorskip("psycopg2")
+    engine = make_engine("postgresql://user@localhost/memote")
+    assert isinstance(engine.pool, QueuePool)
+    assert 1 <= engine.pool.size() <= 10
+    assert engine.pool._pre_ping